@@ -0,0 +1,5 @@
+@echo off
+call .venv\Scripts\activate
+python src\backfill.py run --symbol BTCUSDT --interval 1h --start 2020-01-01 --end 2024-12-31 --out data\klines --workers 2
+python src\backfill.py status --job data\klines\_backfill\BTCUSDT_1h_2020-01-01_2024-12-31
+pause
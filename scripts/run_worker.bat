@@ -0,0 +1,3 @@
+@echo off
+call .venv\Scripts\activate
+python src\cli.py worker --port 8765
@@ -0,0 +1,222 @@
+"""
+Checkpointed, resumable kline backfill.
+
+The date range is split into whole-day windows. Each window is downloaded,
+written to partitioned Parquet, and only then recorded in an append-only
+manifest, so a killed job resumes from the first incomplete window. Windows
+are striped across worker processes (window i -> worker i % N), one manifest
+file per worker.
+
+    python src/backfill.py run --symbol BTCUSDT --interval 1h --start 2020-01-01 --end 2024-12-31 --out data/klines --workers 4
+    python src/backfill.py status --job data/klines/_backfill/BTCUSDT_1h_2020-01-01_2024-12-31
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import time
+from pathlib import Path
+
+from utils import setup_logging, to_millis, from_millis, floor_to_day, ceil_to_day
+
+DAY_MS = 24 * 60 * 60 * 1000
+# throughput for the ETA is measured over windows finished in the last RATE_SPAN_SECS
+RATE_SPAN_SECS = 15 * 60
+
+def plan_windows(start_ms: int, end_ms: int, window_days: int = 1) -> list[tuple[int, int]]:
+    """Half-open [start, end) windows of `window_days` days, aligned to 00:00 UTC."""
+    step = window_days * DAY_MS
+    first = floor_to_day(start_ms)
+    return [(s, min(s + step, end_ms)) for s in range(first, end_ms, step)]
+
+def job_dir_for(out: str, symbol: str, interval: str, start: str, end: str) -> Path:
+    return Path(out) / "_backfill" / f"{symbol}_{interval}_{start}_{end}"
+
+def init_job(job_dir: Path, job: dict) -> dict:
+    """Create job.json, or check that an existing job has the same parameters."""
+    path = job_dir / "job.json"
+    if path.exists():
+        with open(path, encoding="utf-8") as f:
+            existing = json.load(f)
+        if existing != job:
+            raise SystemExit(f"{path} was created with different parameters: {existing}")
+        return existing
+    job_dir.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(job, f, indent=2)
+    return job
+
+def load_job(job_dir: Path) -> dict:
+    with open(Path(job_dir) / "job.json", encoding="utf-8") as f:
+        return json.load(f)
+
+def completed_windows(job_dir: Path) -> dict[int, dict]:
+    """Manifest entries of every worker, keyed by window start."""
+    done = {}
+    for path in sorted(Path(job_dir).glob("manifest-*.jsonl")):
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # torn last line from a crash mid-append; that window is redone and
+                    # the owning worker truncates it (repair_manifest) before appending
+                    continue
+                done[entry["start"]] = entry
+    return done
+
+def repair_manifest(manifest: Path) -> None:
+    """Drop a torn last line, so the next append doesn't get glued onto it."""
+    if not manifest.exists():
+        return
+    with open(manifest, "rb+") as f:
+        data = f.read()
+        if not data or data.endswith(b"\n"):
+            return
+        f.truncate(data.rfind(b"\n") + 1)
+        f.flush()
+        os.fsync(f.fileno())
+    logging.warning("Truncated torn last line of %s", manifest)
+
+def record_window(manifest: Path, entry: dict) -> None:
+    with open(manifest, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def run_windows(job_dir: Path, worker_index: int = 0, num_workers: int = 1) -> int:
+    """Download this worker's pending windows. Returns the number completed."""
+    setup_logging()
+    import requests
+    from binance_rest import download_klines
+    from storage import write_parquet_partitioned
+
+    job = load_job(job_dir)
+    windows = plan_windows(job["start_ms"], job["end_ms"], job["window_days"])
+    done = completed_windows(job_dir)
+    now_ms = time.time() * 1000
+    pending = [w for i, w in enumerate(windows)
+               if i % num_workers == worker_index and w[0] not in done]
+    # a window still open would be rewritten under a different file name later
+    open_windows = [w for w in pending if w[1] > now_ms]
+    pending = [w for w in pending if w[1] <= now_ms]
+    logging.info("Worker %d/%d: %d pending windows (%d not closed yet, skipped)",
+                 worker_index, num_workers, len(pending), len(open_windows))
+
+    manifest = Path(job_dir) / f"manifest-{worker_index}.jsonl"
+    repair_manifest(manifest)
+    session = requests.Session()
+    count = 0
+    for start_ms, end_ms in pending:
+        t0 = time.perf_counter()
+        # klines endTime is inclusive
+        df = download_klines(job["symbol"], job["interval"], start_ms, end_ms - 1, session=session)
+        files = write_parquet_partitioned(df, job["out"], job["symbol"], job["interval"]) if not df.empty else []
+        record_window(manifest, {
+            "start": start_ms,
+            "end": end_ms,
+            "rows": len(df),
+            "files": files,
+            "worker": worker_index,
+            "elapsed_s": round(time.perf_counter() - t0, 3),
+            "done_at": time.time(),
+        })
+        count += 1
+        logging.info("Window %s: %d rows", from_millis(start_ms).date(), len(df))
+    return count
+
+def _fmt_duration(secs: float) -> str:
+    secs = int(secs)
+    h, rem = divmod(secs, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}h{m:02d}m" if h else f"{m}m{s:02d}s"
+
+def status_line(job_dir: Path) -> str:
+    job = load_job(job_dir)
+    windows = plan_windows(job["start_ms"], job["end_ms"], job["window_days"])
+    done = completed_windows(job_dir)
+    n_done = sum(1 for s, _ in windows if s in done)
+    rows = sum(e["rows"] for e in done.values())
+    head = (f"{job['symbol']} {job['interval']} {job['start']}..{job['end']}: "
+            f"{n_done}/{len(windows)} windows ({100.0 * n_done / max(len(windows), 1):.1f}%), {rows} rows")
+    if n_done == len(windows):
+        return head + " | complete"
+
+    next_start = next(s for s, _ in windows if s not in done)
+    head += f" | next {from_millis(next_start).date()}"
+    stamps = sorted(e["done_at"] for e in done.values())
+    now = time.time()
+    recent = [t for t in stamps if t >= now - RATE_SPAN_SECS]
+    if not recent:
+        if not stamps:
+            return head + " | not started"
+        return head + f" | stalled, last progress {_fmt_duration(now - stamps[-1])} ago"
+    if len(recent) < 2 or recent[-1] == recent[0]:
+        return head + " | ETA unknown"
+    rate = (len(recent) - 1) / (recent[-1] - recent[0])
+    eta = (len(windows) - n_done) / rate
+    return head + f" | {rate * 60:.1f} windows/min | ETA {_fmt_duration(eta)}"
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser()
+    sub = ap.add_subparsers(dest="action", required=True)
+    run = sub.add_parser("run", help="Start or resume a backfill job")
+    run.add_argument("--symbol", required=True, help="e.g., BTCUSDT")
+    run.add_argument("--interval", required=True, help="e.g., 1m, 5m, 1h, 1d")
+    run.add_argument("--start", required=True, help="ISO date (UTC) e.g., 2020-01-01")
+    run.add_argument("--end", required=True, help="ISO date (UTC), inclusive e.g., 2024-12-31")
+    run.add_argument("--out", required=True, help="Output base directory for Parquet")
+    run.add_argument("--window-days", type=int, default=1, help="Days per checkpointed window")
+    run.add_argument("--workers", type=int, default=1, help="Worker processes to spawn")
+    run.add_argument("--worker-index", type=int, default=None,
+                     help="Run only this worker's share of --workers N (e.g. one scheduled task per worker)")
+    run.add_argument("--job", default=None, help="Job directory (default: {out}/_backfill/...)")
+    status = sub.add_parser("status", help="Print one-line progress and ETA")
+    status.add_argument("--job", required=True, help="Job directory")
+    return ap.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.action == "status":
+        print(status_line(Path(args.job)))
+        return
+
+    setup_logging()
+    if args.worker_index is not None and not 0 <= args.worker_index < args.workers:
+        raise SystemExit("--worker-index must be in [0, --workers)")
+    symbol = args.symbol.upper()
+    job_dir = Path(args.job) if args.job else job_dir_for(args.out, symbol, args.interval, args.start, args.end)
+    init_job(job_dir, {
+        "symbol": symbol,
+        "interval": args.interval,
+        "start": args.start,
+        "end": args.end,
+        "start_ms": to_millis(args.start),
+        # end date is inclusive: run to 00:00 UTC of the following day
+        "end_ms": ceil_to_day(to_millis(args.end)),
+        "window_days": args.window_days,
+        "out": args.out,
+    })
+    logging.info("Backfill job %s", job_dir)
+
+    if args.worker_index is not None:
+        run_windows(job_dir, args.worker_index, args.workers)
+    elif args.workers <= 1:
+        run_windows(job_dir)
+    else:
+        procs = [multiprocessing.Process(target=run_windows, args=(job_dir, k, args.workers))
+                 for k in range(args.workers)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        failed = [k for k, p in enumerate(procs) if p.exitcode != 0]
+        if failed:
+            raise SystemExit(f"Workers {failed} failed; rerun to resume")
+    print(status_line(job_dir))
+
+if __name__ == "__main__":
+    main()
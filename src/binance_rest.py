@@ -81,9 +81,9 @@ def klines_generator(
             break
         params["startTime"] = next_start
 
-def download_klines(symbol: str, interval: str, start: str, end: str) -> pd.DataFrame:
-    import requests
-    s = requests.Session()
+def download_klines(symbol: str, interval: str, start: str, end: str,
+                    session: Optional[requests.Session] = None) -> pd.DataFrame:
+    s = session or requests.Session()
     start_ms = to_millis(start)
     end_ms = to_millis(end)
     frames = []
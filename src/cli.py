@@ -0,0 +1,120 @@
+"""
+Unified CLI: one entry point for every pipeline step.
+
+Heavy libraries (pandas, pyarrow, sklearn, joblib) are only imported by the
+module behind the chosen subcommand, so `--help` and dispatch stay cheap.
+Jobs can optionally be handed to a warm worker (see worker.py).
+
+    python src/cli.py fetch --symbol BTCUSDT --interval 1h --start 2023-01-01 --end 2023-12-31 --out data/klines
+    python src/cli.py --worker 127.0.0.1:8765 update --symbol BTCUSDT --interval 1h
+"""
+from __future__ import annotations
+
+import time
+
+_T0 = time.perf_counter()
+
+import argparse
+import importlib
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# subcommand -> (module, help)
+COMMANDS = {
+    "fetch": ("fetch_klines", "Download OHLCV klines to partitioned Parquet"),
+    "update": ("update_fetch_klines", "Incrementally update klines up to today"),
+    "backfill": ("backfill", "Resumable, checkpointed backfill (run / status)"),
+    "features": ("features", "Build ML features from Parquet partitions"),
+    "train": ("train_model", "Train/evaluate the RandomForest model"),
+    "export-forest": ("export_forest", "Export a RandomForest to the compact mmap format"),
+    "train-lasso": ("train_model_lasso", "Train the Lasso return model"),
+    "export-lasso": ("export_lasso", "Export Lasso + scaler as a compact predictor"),
+    "predict": ("predict_lasso", "Predict next close with a trained Lasso model"),
+    "forecast": ("predict_future_lasso", "Recursive multi-step Lasso forecast"),
+    "stream": ("stream_ws", "Stream Binance WebSocket events to JSONL"),
+}
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Crypto ML pipeline. Run `cli.py <command> --help` for command options.",
+    )
+    ap.add_argument("--worker", default=os.environ.get("CLI_WORKER"),
+                    help="Send the job to a warm worker at HOST:PORT (falls back to local run)")
+    ap.add_argument("--timings-out", default=os.environ.get("CLI_TIMINGS_OUT"),
+                    help="Append startup/run timings as JSONL to this file")
+    sub = ap.add_subparsers(dest="command", metavar="command", required=True)
+    for name, (_, help_) in COMMANDS.items():
+        # options are parsed by the target module itself
+        sub.add_parser(name, help=help_, add_help=False)
+    sub.add_parser("worker", help="Start a warm worker (libraries preloaded)", add_help=False)
+    return ap.parse_known_args(argv)
+
+def run_command(command: str, argv: list[str]) -> dict:
+    """Import the module behind `command` and run its main(argv).
+
+    Returns exit code and timings; import_s is the cold-start cost of the command.
+    """
+    module_name, _ = COMMANDS[command]
+    t0 = time.perf_counter()
+    module = importlib.import_module(module_name)
+    t1 = time.perf_counter()
+    code = 0
+    try:
+        module.main(argv)
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            # e.g. raise SystemExit("--model-in is required with --predict")
+            print(e.code, file=sys.stderr)
+            code = 1
+    t2 = time.perf_counter()
+    return {"code": code, "import_s": t1 - t0, "run_s": t2 - t1}
+
+def record_timings(path: str, record: dict) -> None:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+def main(argv=None):
+    args, rest = parse_args(argv)
+    if args.command == "worker":
+        import worker
+        return worker.main(rest)
+
+    dispatch_s = time.perf_counter() - _T0
+    result = None
+    mode = "local"
+    if args.worker:
+        import worker
+        # long-running commands the worker refuses always run here
+        if args.command not in worker.BLOCKED_COMMANDS:
+            result = worker.submit(args.worker, args.command, rest)
+        if result is not None:
+            mode = "worker"
+            sys.stdout.write(result.pop("stdout", ""))
+            sys.stderr.write(result.pop("stderr", ""))
+    if result is None:
+        result = run_command(args.command, rest)
+
+    if args.timings_out:
+        record_timings(args.timings_out, {
+            "ts": datetime.now(tz=timezone.utc).isoformat(),
+            "command": args.command,
+            "mode": mode,
+            "dispatch_s": round(dispatch_s, 6),
+            "import_s": round(result["import_s"], 6),
+            "run_s": round(result["run_s"], 6),
+            "total_s": round(time.perf_counter() - _T0, 6),
+            "code": result["code"],
+        })
+    return result["code"]
+
+if __name__ == "__main__":
+    sys.exit(main())
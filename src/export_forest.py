@@ -0,0 +1,167 @@
+"""
+Export a fitted RandomForestRegressor to a compact, memory-mappable format.
+
+All trees are flattened into contiguous node arrays stored as .npy files in
+one directory:
+    feature.npy       int32   split feature per node (-1 at leaves)
+    threshold.npy     float32 go left if x <= threshold
+    children.npy      int32   [left, right] global child indices of node i at 2*i, 2*i+1
+    missing_left.npy  uint8   1 if NaN goes left at this node (sklearn's missing_go_to_left)
+    value.npy         float32 leaf value (mean target of the node)
+    roots.npy         int32   root node of each tree
+    meta.json         feature names, tree count, max depth
+Loading memory-maps the arrays, so processes serving the same model share pages.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from pathlib import Path
+import numpy as np
+
+from utils import setup_logging
+
+ARRAYS = ["feature", "threshold", "children", "missing_left", "value", "roots"]
+
+def _float32_floor(x: np.ndarray) -> np.ndarray:
+    """Largest float32 <= x. sklearn compares float32 inputs against float64
+    thresholds; rounding down keeps `x <= threshold` decisions identical."""
+    f = x.astype(np.float32)
+    over = f.astype(np.float64) > x
+    f[over] = np.nextafter(f[over], np.float32(-np.inf))
+    return f
+
+def flatten_forest(model) -> tuple[dict, dict]:
+    """Return (arrays, meta) for a fitted RandomForestRegressor."""
+    if getattr(model, "n_outputs_", 1) != 1:
+        raise ValueError("Only single-output forests are supported")
+    feats, thrs, children, missing_left, values, roots = [], [], [], [], [], []
+    offset, max_depth = 0, 0
+    supports_missing = True
+    for est in model.estimators_:
+        t = est.tree_
+        n = t.node_count
+        leaf = t.children_left < 0
+        feats.append(np.where(leaf, -1, t.feature))
+        thrs.append(np.where(leaf, 0.0, t.threshold))
+        pairs = np.stack([t.children_left, t.children_right], axis=1)
+        children.append(np.where(leaf[:, None], -1, pairs + offset).ravel())
+        # sklearn < 1.3 has no NaN support; predict() rejects NaN for such forests
+        mgl = getattr(t, "missing_go_to_left", None)
+        missing_left.append(np.zeros(n, dtype=np.uint8) if mgl is None else np.asarray(mgl))
+        supports_missing = supports_missing and mgl is not None
+        values.append(t.value[:, 0, 0])
+        roots.append(offset)
+        offset += n
+        max_depth = max(max_depth, int(t.max_depth))
+    if offset >= np.iinfo(np.int32).max:
+        raise ValueError(f"Forest has {offset} nodes; too many for int32 indices")
+    arrays = {
+        "feature": np.concatenate(feats).astype(np.int32),
+        "threshold": _float32_floor(np.concatenate(thrs)),
+        "children": np.concatenate(children).astype(np.int32),
+        "missing_left": np.concatenate(missing_left).astype(np.uint8),
+        "value": np.concatenate(values).astype(np.float32),
+        "roots": np.asarray(roots, dtype=np.int32),
+    }
+    names = getattr(model, "feature_names_in_", None)
+    meta = {
+        "n_features": int(model.n_features_in_),
+        "feature_names": [str(c) for c in names] if names is not None else None,
+        "n_trees": len(model.estimators_),
+        "n_nodes": int(offset),
+        "max_depth": max_depth,
+        "supports_missing": supports_missing,
+    }
+    return arrays, meta
+
+class CompactForest:
+    def __init__(self, arrays: dict, meta: dict):
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        self.meta = meta
+        self.feature_names = meta.get("feature_names")
+        self.max_depth = int(meta["max_depth"])
+
+    @classmethod
+    def from_sklearn(cls, model) -> "CompactForest":
+        return cls(*flatten_forest(model))
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "CompactForest":
+        base = Path(path)
+        with open(base / "meta.json", encoding="utf-8") as f:
+            meta = json.load(f)
+        mode = "r" if mmap else None
+        arrays = {name: np.load(base / f"{name}.npy", mmap_mode=mode) for name in ARRAYS
+                  if (base / f"{name}.npy").exists()}
+        if "missing_left" not in arrays:
+            # exported before NaN routing was stored: predict() rejects NaN input
+            arrays["missing_left"] = np.zeros(len(arrays["feature"]), dtype=np.uint8)
+            meta["supports_missing"] = False
+        return cls(arrays, meta)
+
+    def save(self, path: str) -> None:
+        base = Path(path)
+        base.mkdir(parents=True, exist_ok=True)
+        for name in ARRAYS:
+            np.save(base / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        with open(base / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, indent=2)
+
+    def predict(self, X, batch_size: int = 256) -> np.ndarray:
+        """Mean of tree predictions, like RandomForestRegressor.predict.
+
+        X: DataFrame (columns picked by the trained feature names) or 2D array.
+        Every (row, tree) path advances one level per step; finished paths are
+        dropped so each step only touches nodes still being traversed.
+        """
+        if self.feature_names is not None and hasattr(X, "columns"):
+            X = X[self.feature_names]
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        has_nan = bool(np.isnan(X).any())
+        if has_nan and not self.meta.get("supports_missing", False):
+            raise ValueError("Input contains NaN but this forest has no missing-value routing; re-export it")
+        n_rows, n_features = X.shape
+        roots = np.asarray(self.roots)
+        out = np.empty(n_rows, dtype=np.float64)
+        for start in range(0, n_rows, batch_size):
+            flat = X[start:start + batch_size].ravel()
+            n = len(flat) // n_features
+            row = np.repeat(np.arange(n, dtype=np.int64), len(roots))
+            node = np.tile(roots, n)
+            total = np.zeros(n, dtype=np.float64)
+            while len(node):
+                f = self.feature[node]
+                leaf = f < 0
+                if leaf.any():
+                    total += np.bincount(row[leaf], weights=self.value[node[leaf]], minlength=n)
+                    keep = ~leaf
+                    row, node, f = row[keep], node[keep], f[keep]
+                    if not len(node):
+                        break
+                x = flat[row * n_features + f]
+                go_right = x > self.threshold[node]
+                if has_nan:
+                    # NaN compares False (left); follow sklearn's learned direction instead
+                    go_right |= np.isnan(x) & (self.missing_left[node] == 0)
+                node = self.children[2 * node.astype(np.int64) + go_right]
+            out[start:start + n] = total / len(roots)
+        return out
+
+def main(argv=None):
+    setup_logging()
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model", required=True, help="RandomForest saved by train_model.py (joblib)")
+    ap.add_argument("--out", required=True, help="Output directory for the compact forest")
+    args = ap.parse_args(argv)
+
+    import joblib
+    forest = CompactForest.from_sklearn(joblib.load(args.model))
+    forest.save(args.out)
+    logging.info("Saved %d trees / %d nodes (max depth %d) to %s",
+                 forest.meta["n_trees"], forest.meta["n_nodes"], forest.max_depth, args.out)
+
+if __name__ == "__main__":
+    main()
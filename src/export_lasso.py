@@ -0,0 +1,83 @@
+"""
+Export a trained Lasso + StandardScaler as a compact linear predictor.
+
+The scaler's mean/scale are folded into the nonzero coefficients, so prediction
+is one dot product over only the columns the model uses:
+    pred = intercept + X[:, columns] @ coef
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+from pathlib import Path
+import numpy as np
+
+from utils import setup_logging
+
+# same selection as train_model_lasso.load_features
+DROP_COLS = ["target", "y_next_close", "y_next_ret", "open_time", "close_time", "open_ts"]
+
+def feature_columns(df) -> list[str]:
+    """Model input columns of a features frame, in training order."""
+    X = df.drop(columns=[c for c in DROP_COLS if c in df.columns])
+    return list(X.select_dtypes(include=["number"]).columns)
+
+class CompactLasso:
+    def __init__(self, columns: list[str], coef, intercept: float):
+        self.columns = list(columns)
+        self.coef = np.asarray(coef, dtype=float)
+        self.intercept = float(intercept)
+
+    @classmethod
+    def from_sklearn(cls, model, scaler, columns: list[str]) -> "CompactLasso":
+        coef = np.asarray(model.coef_, dtype=float).ravel()
+        if len(coef) != len(columns):
+            raise ValueError(f"Model has {len(coef)} coefficients but {len(columns)} columns were given")
+        # with_mean=False still sets mean_, it is just not subtracted
+        mean = scaler.mean_ if scaler.with_mean else np.zeros_like(coef)
+        scale = scaler.scale_ if scaler.with_std else np.ones_like(coef)
+        w = coef / scale
+        intercept = float(model.intercept_) - float(np.dot(w, mean))
+        keep = np.flatnonzero(coef)
+        return cls([columns[i] for i in keep], w[keep], intercept)
+
+    @classmethod
+    def load(cls, path: str) -> "CompactLasso":
+        with open(path, encoding="utf-8") as f:
+            d = json.load(f)
+        return cls(d["columns"], d["coef"], d["intercept"])
+
+    def save(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"columns": self.columns, "coef": self.coef.tolist(),
+                       "intercept": self.intercept}, f, indent=2)
+
+    def predict(self, X) -> np.ndarray:
+        """X: 2D array whose columns are in `self.columns` order."""
+        return np.asarray(X, dtype=float) @ self.coef + self.intercept
+
+def main(argv=None):
+    setup_logging()
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--features", required=True, help="Features parquet the model was trained on (for column names)")
+    ap.add_argument("--model", required=True, help="Path to trained Lasso model")
+    ap.add_argument("--scaler", required=True, help="Path to saved Scaler")
+    ap.add_argument("--out", required=True, help="Output JSON for the compact predictor")
+    args = ap.parse_args(argv)
+
+    import joblib
+    import pyarrow.parquet as pq
+    # schema only: no need to read the data to recover column names
+    schema = pq.read_schema(args.features)
+    df = schema.empty_table().to_pandas()
+    columns = feature_columns(df)
+
+    compact = CompactLasso.from_sklearn(joblib.load(args.model), joblib.load(args.scaler), columns)
+    compact.save(args.out)
+    logging.info("Kept %d of %d features: %s", len(compact.columns), len(columns), compact.columns)
+    logging.info("Saved compact Lasso to %s", args.out)
+
+if __name__ == "__main__":
+    main()
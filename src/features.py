@@ -33,29 +33,63 @@ def load_parquet_root(root: str, symbol: str, interval: str) -> pd.DataFrame:
     df = pd.concat(dfs, ignore_index=True)
     return df
 
-def build_features(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.sort_values("open_time").reset_index(drop=True)
-    # core time index
-    df["open_ts"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
+# EMAs never fully forget; this many spans of history keeps a truncated EMA
+# within ~1e-7 (relative) of one computed over the full series.
+EMA_WARMUP = 10
+
+def _macd_columns(close: pd.Series) -> dict:
+    macd_line, signal_line, hist = macd(close)
+    return {"macd": macd_line, "macd_signal": signal_line, "macd_hist": hist}
+
+def _feature_groups() -> list:
+    """
+    (columns, compute(df) -> {column: series}, rows of history needed for the last value).
+    Order matters: it fixes the column order models were trained on.
+    """
+    groups = []
     # returns
-    df["ret_1"] = df["close"].pct_change()
-    df["ret_5"] = df["close"].pct_change(5)
-    df["ret_10"] = df["close"].pct_change(10)
+    for n in [1, 5, 10]:
+        groups.append(([f"ret_{n}"], lambda d, n=n: {f"ret_{n}": d["close"].pct_change(n)}, n + 1))
     # rolling stats
     for w in [7, 20, 50]:
-        df[f"sma_{w}"] = df["close"].rolling(w).mean()
-        df[f"ema_{w}"] = df["close"].ewm(span=w, adjust=False).mean()
-        df[f"std_{w}"] = df["close"].rolling(w).std()
+        groups.append(([f"sma_{w}"], lambda d, w=w: {f"sma_{w}": d["close"].rolling(w).mean()}, w))
+        groups.append(([f"ema_{w}"], lambda d, w=w: {f"ema_{w}": d["close"].ewm(span=w, adjust=False).mean()},
+                       EMA_WARMUP * w))
+        groups.append(([f"std_{w}"], lambda d, w=w: {f"std_{w}": d["close"].rolling(w).std()}, w))
     # RSI & MACD
-    df["rsi_14"] = rsi(df["close"], 14)
-    macd_line, signal_line, hist = macd(df["close"])
-    df["macd"] = macd_line
-    df["macd_signal"] = signal_line
-    df["macd_hist"] = hist
+    groups.append((["rsi_14"], lambda d: {"rsi_14": rsi(d["close"], 14)}, 15))
+    groups.append((["macd", "macd_signal", "macd_hist"], lambda d: _macd_columns(d["close"]),
+                   EMA_WARMUP * (26 + 9)))
     # lags
     for l in [1,2,3,5,10]:
-        df[f"close_lag_{l}"] = df["close"].shift(l)
-        df[f"vol_lag_{l}"] = df["volume"].shift(l)
+        groups.append(([f"close_lag_{l}"], lambda d, l=l: {f"close_lag_{l}": d["close"].shift(l)}, l + 1))
+        groups.append(([f"vol_lag_{l}"], lambda d, l=l: {f"vol_lag_{l}": d["volume"].shift(l)}, l + 1))
+    return groups
+
+FEATURE_GROUPS = _feature_groups()
+
+def history_depth(columns) -> int:
+    """Rows of OHLCV history build_features needs to produce `columns` for the last usable row."""
+    columns = set(columns)
+    depth = 1
+    for cols, _, lookback in FEATURE_GROUPS:
+        if columns.intersection(cols):
+            depth = max(depth, lookback)
+    # +1: the newest row is dropped because its next-close target is unknown
+    return depth + 1
+
+def build_features(df: pd.DataFrame, columns=None) -> pd.DataFrame:
+    """
+    Add indicator columns, next-step targets and drop incomplete rows.
+    If `columns` is given, only the indicators producing those columns are computed.
+    """
+    df = df.sort_values("open_time").reset_index(drop=True)
+    # core time index
+    df["open_ts"] = pd.to_datetime(df["open_time"], unit="ms", utc=True)
+    for cols, compute, _ in FEATURE_GROUPS:
+        if columns is None or not set(columns).isdisjoint(cols):
+            for name, values in compute(df).items():
+                df[name] = values
     # target: next close (regression) & next return
     df["y_next_close"] = df["close"].shift(-1)
     df["y_next_ret"] = df["close"].pct_change().shift(-1)
@@ -63,16 +97,16 @@ def build_features(df: pd.DataFrame) -> pd.DataFrame:
     df = df.dropna().reset_index(drop=True)
     return df
 
-def parse_args():
+def parse_args(argv=None):
     ap = argparse.ArgumentParser()
     ap.add_argument("--root", required=True, help="Parquet root created by fetch_klines.py")
     ap.add_argument("--symbol", required=True, help="e.g., BTCUSDT")
     ap.add_argument("--interval", required=True, help="e.g., 1h")
     ap.add_argument("--out", required=True, help="Output Parquet file for features")
-    return ap.parse_args()
+    return ap.parse_args(argv)
 
-def main():
-    args = parse_args()
+def main(argv=None):
+    args = parse_args(argv)
     df = load_parquet_root(args.root, args.symbol.upper(), args.interval)
     feat = build_features(df)
     Path(args.out).parent.mkdir(parents=True, exist_ok=True)
@@ -8,25 +8,37 @@ import numpy as np
 import joblib
 from pathlib import Path
 from utils import setup_logging
-from features import build_features 
+from features import build_features, history_depth
+from export_lasso import CompactLasso
 
 def recursive_forecast(df: pd.DataFrame, model, scaler, steps: int, interval="1h"):
-    history = df.copy()
+    """
+    model/scaler: sklearn Lasso + StandardScaler, or a CompactLasso with scaler=None.
+    A CompactLasso only needs its own indicators over the last history_depth() rows.
+    """
+    compact = isinstance(model, CompactLasso)
+    depth = history_depth(model.columns) if compact else None
+    history = df.tail(depth).reset_index(drop=True) if compact else df.copy()
     preds = []
 
     for i in range(steps):
-        # build features lại từ history
-        feat = build_features(history.copy())
-
-        # lấy hàng cuối cùng làm input
-        X = feat.drop(columns=["y_next_close", "y_next_ret", "open_time",
-                               "close_time", "open_ts"], errors="ignore")
-        X = X.select_dtypes(include=["number"])
-        X_last = X.values[-1].reshape(1, -1)
-
-        # scale và predict return
-        X_last_scaled = scaler.transform(X_last)
-        pred_ret = model.predict(X_last_scaled)[0]
+        if compact:
+            feat = build_features(history.copy(), columns=model.columns)
+            X_last = feat[model.columns].to_numpy(dtype=float)[-1:]
+            pred_ret = model.predict(X_last)[0]
+        else:
+            # build features lại từ history
+            feat = build_features(history.copy())
+
+            # lấy hàng cuối cùng làm input
+            X = feat.drop(columns=["y_next_close", "y_next_ret", "open_time",
+                                   "close_time", "open_ts"], errors="ignore")
+            X = X.select_dtypes(include=["number"])
+            X_last = X.values[-1].reshape(1, -1)
+
+            # scale và predict return
+            X_last_scaled = scaler.transform(X_last)
+            pred_ret = model.predict(X_last_scaled)[0]
 
         last_close = history["close"].iloc[-1]
         pred_price = last_close * (1 + pred_ret)
@@ -40,26 +52,34 @@ def recursive_forecast(df: pd.DataFrame, model, scaler, steps: int, interval="1h
         new_row["close"] = pred_price
         new_row["open_ts"] = ts_next
         history = pd.concat([history, pd.DataFrame([new_row])], ignore_index=True)
+        if compact:
+            history = history.tail(depth).reset_index(drop=True)
 
     return pd.DataFrame(preds, columns=["timestamp", "last_close", "pred_ret", "pred_price"])
 
 
-def main():
+def main(argv=None):
     setup_logging()
     ap = argparse.ArgumentParser()
     ap.add_argument("--features", required=True, help="Path to features parquet")
-    ap.add_argument("--model", required=True, help="Path to Lasso model")
-    ap.add_argument("--scaler", required=True, help="Path to saved Scaler")
+    ap.add_argument("--model", help="Path to Lasso model")
+    ap.add_argument("--scaler", help="Path to saved Scaler")
+    ap.add_argument("--compact", help="Compact predictor from export_lasso.py (replaces --model/--scaler)")
     ap.add_argument("--steps", type=int, default=24, help="How many future steps to predict")
     ap.add_argument("--out", default="pred_future.csv", help="CSV output file")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
+    if not args.compact and not (args.model and args.scaler):
+        ap.error("either --compact or both --model and --scaler are required")
 
     # load data
     df = pd.read_parquet(args.features).sort_values("open_time").reset_index(drop=True)
     logging.info("Loaded %s with %d rows", args.features, len(df))
 
-    model = joblib.load(args.model)
-    scaler = joblib.load(args.scaler)
+    if args.compact:
+        model, scaler = CompactLasso.load(args.compact), None
+    else:
+        model = joblib.load(args.model)
+        scaler = joblib.load(args.scaler)
 
     preds = recursive_forecast(df, model, scaler, steps=args.steps, interval="h")
     preds.to_csv(args.out, index=False)
@@ -8,10 +8,17 @@ import joblib
 import numpy as np
 from pathlib import Path
 from utils import setup_logging
+from export_lasso import CompactLasso
 
-def load_features(path: str):
-    """Load features parquet and return X, y, df"""
-    df = pd.read_parquet(path)
+def load_features(path: str, columns=None):
+    """Load features parquet and return X, y, df.
+
+    With `columns`, only those model inputs are read and X keeps their order.
+    """
+    read_cols = None
+    if columns is not None:
+        read_cols = list(dict.fromkeys(["open_time", "open_ts", "close", "y_next_ret", *columns]))
+    df = pd.read_parquet(path, columns=read_cols)
     df = df.sort_values("open_time").reset_index(drop=True)
 
     # target return
@@ -21,6 +28,9 @@ def load_features(path: str):
     df = df.dropna().reset_index(drop=True)
     y = df["y_next_ret"].values
 
+    if columns is not None:
+        return df[columns].to_numpy(dtype=float), y, df
+
     drop_cols = ["y_next_close", "y_next_ret", "open_time", "close_time", "open_ts"]
     X = df.drop(columns=[c for c in drop_cols if c in df.columns], errors="ignore")
     X = X.select_dtypes(include=["number"])
@@ -28,31 +38,38 @@ def load_features(path: str):
     return X.values, y, df
 
 
-def main():
+def main(argv=None):
     setup_logging()
     ap = argparse.ArgumentParser()
     ap.add_argument("--features", required=True, help="Path to features parquet")
-    ap.add_argument("--model", required=True, help="Path to trained Lasso model")
-    ap.add_argument("--scaler", required=True, help="Path to saved Scaler (joblib)")
+    ap.add_argument("--model", help="Path to trained Lasso model")
+    ap.add_argument("--scaler", help="Path to saved Scaler (joblib)")
+    ap.add_argument("--compact", help="Compact predictor from export_lasso.py (replaces --model/--scaler)")
     ap.add_argument("--n-last", type=int, default=5, help="Number of last rows to predict")
     ap.add_argument("--out", help="Optional path to save predictions as CSV")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
+    if not args.compact and not (args.model and args.scaler):
+        ap.error("either --compact or both --model and --scaler are required")
+
+    # load model + scaler
+    if args.compact:
+        compact = CompactLasso.load(args.compact)
+        predict = compact.predict
+    else:
+        model = joblib.load(args.model)
+        scaler = joblib.load(args.scaler)
+        predict = lambda X_: model.predict(scaler.transform(X_))
 
     # load data
-    X, y, df = load_features(args.features)
+    X, y, df = load_features(args.features, columns=compact.columns if args.compact else None)
     last_close = df["close"].iloc[-1]
     logging.info("Loaded features: %s with %d rows", args.features, len(df))
 
-    # load model + scaler
-    model = joblib.load(args.model)
-    scaler = joblib.load(args.scaler)
-
     # select last N rows for prediction
     X_new = X[-args.n_last:]
     closes = df["close"].iloc[-args.n_last:]
 
-    X_scaled = scaler.transform(X_new)
-    y_pred = model.predict(X_scaled)
+    y_pred = predict(X_new)
 
     # convert return → price prediction
     pred_prices = closes.values * (1 + y_pred)
@@ -71,8 +88,7 @@ def main():
 
     # predict next step (beyond last row)
     X_last = X_new[-1].reshape(1, -1)
-    X_last_scaled = scaler.transform(X_last)
-    next_ret_pred = model.predict(X_last_scaled)[0]
+    next_ret_pred = predict(X_last)[0]
     next_price_pred = last_close * (1 + next_ret_pred)
     logging.info("Next prediction -> return: %.6f, price: %.2f", next_ret_pred, next_price_pred)
 
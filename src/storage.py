@@ -7,10 +7,22 @@ import pathlib
 from typing import Optional
 import pandas as pd
 
+def _fsync_dir(path: pathlib.Path) -> None:
+    """Persist a rename in `path`. Directories can't be opened for fsync on Windows."""
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
 def write_parquet_partitioned(df: pd.DataFrame, base_dir: str, symbol: str, interval: str) -> list[str]:
     """
     Write df grouped by calendar date (UTC) to partitioned Parquet files:
       {base_dir}/symbol={symbol}/interval={interval}/date=YYYY-MM-DD/{min_open_time_ms}-{max_open_time_ms}.parquet
+    Each file is written to a temp name, fsynced and renamed (and the directory fsynced on POSIX),
+    so a crash never leaves a partial file and a returned file survives power loss.
     Returns a list of written file paths.
     """
     if df.empty:
@@ -27,6 +39,11 @@ def write_parquet_partitioned(df: pd.DataFrame, base_dir: str, symbol: str, inte
         outfile = outdir / f"{start_ms}-{end_ms}.parquet"
         # order by open_time and drop helper column
         g = g.sort_values("open_time").drop(columns=["date"])
-        g.to_parquet(outfile, index=False)
+        tmpfile = outfile.with_suffix(".parquet.tmp")
+        g.to_parquet(tmpfile, index=False)
+        with open(tmpfile, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(tmpfile, outfile)
+        _fsync_dir(outdir)
         files.append(str(outfile))
     return files
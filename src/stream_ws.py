@@ -13,13 +13,13 @@ from datetime import datetime, timezone
 from binance_ws import stream
 from utils import setup_logging
 
-def parse_args():
+def parse_args(argv=None):
     ap = argparse.ArgumentParser()
     ap.add_argument("--symbol", required=True, help="BTCUSDT, ETHUSDT, ...")
     ap.add_argument("--stream", required=True, choices=["kline","trade"])
     ap.add_argument("--interval", default=None, help="Required for kline (1m, 5m, 1h, 1d)")
     ap.add_argument("--out", required=True, help="Output JSONL file path")
-    return ap.parse_args()
+    return ap.parse_args(argv)
 
 async def run(args):
     Path(args.out).parent.mkdir(parents=True, exist_ok=True)
@@ -33,9 +33,9 @@ async def run(args):
         if count % 50 == 0:
             logging.info("Wrote %d events to %s", count, args.out)
 
-def main():
+def main(argv=None):
     setup_logging()
-    args = parse_args()
+    args = parse_args(argv)
     if args.stream == "kline" and not args.interval:
         raise SystemExit("--interval is required for kline stream")
     asyncio.run(run(args))
@@ -13,14 +13,17 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, root_mean_s
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import TimeSeriesSplit
 
-def parse_args():
+from export_forest import CompactForest
+
+def parse_args(argv=None):
     ap = argparse.ArgumentParser()
     ap.add_argument("--features", required=True, help="Parquet with engineered features")
     ap.add_argument("--model-out", default=None, help="Path to save fitted model (joblib)")
+    ap.add_argument("--forest-out", default=None, help="Also export compact forest to this directory (with --model-out)")
     ap.add_argument("--predict", action="store_true", help="Predict instead of training")
-    ap.add_argument("--model-in", default=None, help="Load model for prediction")
+    ap.add_argument("--model-in", default=None, help="Load model for prediction (joblib file or compact forest directory)")
     ap.add_argument("--pred-out", default=None, help="CSV to save predictions")
-    return ap.parse_args()
+    return ap.parse_args(argv)
 
 def load_features(path: str):
     df = pd.read_parquet(path)
@@ -46,8 +49,10 @@ def train_eval(X, y):
         rmses.append(root_mean_squared_error(yv, pred))
     return float(sum(maes)/len(maes)), float(sum(rmses)/len(rmses))
 
-def main():
-    args = parse_args()
+def main(argv=None):
+    args = parse_args(argv)
+    if args.forest_out and not args.model_out:
+        raise SystemExit("--forest-out requires --model-out")
     X, y, df = load_features(args.features)
     if not args.predict:
         mae, rmse = train_eval(X, y)
@@ -63,10 +68,16 @@ def main():
             with open(Path(args.model_out).with_suffix(".metrics.json"), "w") as f:
                 json.dump(metrics, f, indent=2)
             print(f"Saved model to {args.model_out}")
+            if args.forest_out:
+                CompactForest.from_sklearn(model).save(args.forest_out)
+                print(f"Saved compact forest to {args.forest_out}")
     else:
         if not args.model_in:
             raise SystemExit("--model-in is required with --predict")
-        model = joblib.load(args.model_in)
+        if Path(args.model_in).is_dir():
+            model = CompactForest.load(args.model_in)
+        else:
+            model = joblib.load(args.model_in)
         pred = model.predict(X)
         out_df = df[["open_time"]].copy()
         out_df["pred_next_close"] = pred
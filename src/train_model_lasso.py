@@ -12,6 +12,7 @@ from sklearn.preprocessing import StandardScaler
 import joblib
 
 from utils import setup_logging
+from export_lasso import CompactLasso, feature_columns
 
 def load_features(path: str):
     df = pd.read_parquet(path)
@@ -45,14 +46,15 @@ def train_eval(X, y, alpha=0.001):
         rmses.append(root_mean_squared_error(yv, pred))
     return np.mean(maes), np.mean(rmses)
 
-def main():
+def main(argv=None):
     setup_logging()
     ap = argparse.ArgumentParser()
     ap.add_argument("--features", required=True, help="Path to features parquet")
     ap.add_argument("--model-out", required=True, help="Path to save model")
     ap.add_argument("--scaler-out", required=True, help="Path to save scaler")
     ap.add_argument("--alpha", type=float, default=0.001, help="Lasso regularization strength")
-    args = ap.parse_args()
+    ap.add_argument("--compact-out", default=None, help="Optional path to save compact predictor (JSON)")
+    args = ap.parse_args(argv)
 
     X, y, df = load_features(args.features)
     logging.info("Loaded %s with shape %s", args.features, X.shape)
@@ -72,5 +74,11 @@ def main():
     logging.info("Saved Lasso model to %s", args.model_out)
     logging.info("Saved Scaler to %s", args.scaler_out)
 
+    if args.compact_out:
+        compact = CompactLasso.from_sklearn(model, scaler, feature_columns(df))
+        compact.save(args.compact_out)
+        logging.info("Saved compact Lasso (%d of %d features) to %s",
+                     len(compact.columns), X.shape[1], args.compact_out)
+
 if __name__ == "__main__":
     main()
@@ -2,18 +2,17 @@
 import argparse
 import os
 from datetime import datetime, timedelta
-import pandas as pd
 
-from binance_rest import download_klines as get_klines
-from storage import write_parquet_partitioned
 
-
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="Auto update OHLCV from Binance")
     parser.add_argument("--symbol", default="BTCUSDT")
     parser.add_argument("--interval", default="1h")
     parser.add_argument("--out", default="data/klines")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    # pandas/pyarrow come in with these; keep them out of `--help`
+    from binance_rest import download_klines as get_klines
+    from storage import write_parquet_partitioned
 
     start_date = datetime(2020, 1, 1).date()
     end_date = datetime.utcnow().date()  # hôm nay UTC
@@ -0,0 +1,202 @@
+"""
+Warm worker: keeps pandas/pyarrow/sklearn/joblib and the pipeline modules
+imported, and runs cli.py jobs sent over a local socket.
+
+On POSIX the worker preforks --procs processes sharing one listening socket;
+on Windows it serves from a single process.
+
+Jobs are pickled, so the auth key is what stands between the port and code
+execution. It comes from CLI_WORKER_AUTHKEY, or else from a random key the
+worker writes to a user-only file (CLI_WORKER_KEYFILE, default
+~/.crypto-ml/worker.key) that submit() reads.
+
+    python src/cli.py worker --port 8765 --procs 2
+    python src/cli.py --worker 127.0.0.1:8765 predict --features ... --model ... --scaler ...
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import io
+import ipaddress
+import logging
+import os
+import secrets
+import sys
+from pathlib import Path
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+from utils import setup_logging
+
+HEAVY_MODULES = ["numpy", "pandas", "pyarrow", "pyarrow.parquet", "joblib",
+                 "sklearn.ensemble", "sklearn.linear_model", "sklearn.preprocessing"]
+# long-running commands that would tie up a worker process forever
+BLOCKED_COMMANDS = {"stream", "backfill"}
+
+def _keyfile() -> Path:
+    return Path(os.environ.get("CLI_WORKER_KEYFILE", Path.home() / ".crypto-ml" / "worker.key"))
+
+def _authkey(create: bool = False) -> bytes | None:
+    """CLI_WORKER_AUTHKEY, else the key file; with create=True a missing key file is generated."""
+    env = os.environ.get("CLI_WORKER_AUTHKEY")
+    if env:
+        return env.encode()
+    path = _keyfile()
+    if path.exists():
+        return path.read_bytes().strip()
+    if not create:
+        return None
+    path.parent.mkdir(parents=True, exist_ok=True)
+    key = secrets.token_hex(32)
+    # owner read/write only (ignored on Windows, where the profile dir is already per-user)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(key)
+    logging.info("Generated worker auth key in %s", path)
+    return key.encode()
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def _parse_address(address: str) -> tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+class _CurrentStdoutHandler(logging.StreamHandler):
+    """Log to whatever sys.stdout is right now, so job logs reach the client."""
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+def preload() -> None:
+    import cli
+    for name in HEAVY_MODULES:
+        importlib.import_module(name)
+    for cmd, (module_name, _) in cli.COMMANDS.items():
+        if cmd not in BLOCKED_COMMANDS:
+            importlib.import_module(module_name)
+
+def handle(job: dict) -> dict:
+    import cli
+    command, argv = job["command"], list(job.get("argv", []))
+    out, err = io.StringIO(), io.StringIO()
+    if command not in cli.COMMANDS or command in BLOCKED_COMMANDS:
+        return {"code": 2, "stdout": "", "stderr": f"worker cannot run '{command}'\n",
+                "import_s": 0.0, "run_s": 0.0}
+    prev_cwd = os.getcwd()
+    try:
+        if job.get("cwd"):
+            os.chdir(job["cwd"])
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                result = cli.run_command(command, argv)
+            except Exception:
+                logging.exception("Job %s failed", command)
+                result = {"code": 1, "import_s": 0.0, "run_s": 0.0}
+    finally:
+        os.chdir(prev_cwd)
+    result["stdout"] = out.getvalue()
+    result["stderr"] = err.getvalue()
+    return result
+
+def serve(listener: Listener) -> None:
+    while True:
+        try:
+            conn = listener.accept()
+        except Exception as e:
+            logging.warning("Rejected connection: %s", e)
+            continue
+        # one bad or vanished client must not take the worker down
+        try:
+            with conn:
+                job = conn.recv()
+                conn.send(handle(job))
+        except EOFError:
+            continue
+        except Exception as e:
+            logging.warning("Dropped job connection: %r", e)
+            continue
+
+def submit(address: str, command: str, argv: list[str]) -> dict | None:
+    """Run a job on the worker at `address`.
+
+    Returns None if no worker is reachable (run locally instead), or a failed
+    result if the connection is lost mid-job.
+    """
+    authkey = _authkey()
+    if authkey is None:
+        print("No worker auth key (set CLI_WORKER_AUTHKEY or start the worker once), running locally",
+              file=sys.stderr)
+        return None
+    try:
+        conn = Client(_parse_address(address), authkey=authkey)
+    except OSError:
+        print(f"Worker {address} not reachable, running locally", file=sys.stderr)
+        return None
+    except AuthenticationError:
+        print(f"Worker {address} rejected the auth key, running locally", file=sys.stderr)
+        return None
+    try:
+        with conn:
+            conn.send({"command": command, "argv": argv, "cwd": os.getcwd()})
+            return conn.recv()
+    except (EOFError, OSError) as e:
+        # the job may have partly run, so don't silently rerun it locally
+        return {"code": 1, "stdout": "", "stderr": f"Worker {address} dropped the job: {e!r}\n",
+                "import_s": 0.0, "run_s": 0.0}
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(prog="cli.py worker")
+    ap.add_argument("--host", default="127.0.0.1",
+                    help="Bind address; non-loopback requires CLI_WORKER_AUTHKEY")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--procs", type=int, default=1, help="Preforked processes (POSIX only)")
+    return ap.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    if not _is_loopback(args.host) and not os.environ.get("CLI_WORKER_AUTHKEY"):
+        raise SystemExit(f"Refusing to bind {args.host} without an explicit CLI_WORKER_AUTHKEY")
+    root = logging.getLogger()
+    root.addHandler(_CurrentStdoutHandler())
+    root.setLevel(logging.INFO)
+    # jobs call setup_logging(); with a handler installed it is a no-op
+    setup_logging()
+
+    authkey = _authkey(create=True)
+    preload()
+    listener = Listener((args.host, args.port), authkey=authkey)
+    logging.info("Worker listening on %s:%d", args.host, args.port)
+
+    procs = args.procs if hasattr(os, "fork") else 1
+    if procs <= 1:
+        serve(listener)
+        return
+    children = set()
+    while True:
+        while len(children) < procs:
+            pid = os.fork()
+            if pid == 0:
+                try:
+                    serve(listener)
+                finally:
+                    os._exit(1)
+            children.add(pid)
+        pid, status = os.wait()
+        children.discard(pid)
+        logging.warning("Worker process %d exited (%s); respawning", pid, status)
+
+if __name__ == "__main__":
+    main()